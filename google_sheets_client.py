@@ -6,6 +6,7 @@ from google.oauth2 import service_account
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
 from dotenv import load_dotenv
 
 try:
@@ -15,8 +16,29 @@ except ImportError:
     PANDAS_AVAILABLE = False
     print("pandas not available - using basic list operations")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 load_dotenv()
 
+
+class OrjsonJsonModel(JsonModel):
+    """JsonModel that parses response bodies with orjson; request bodies keep the stdlib encoder"""
+
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Not JSON - let JsonModel hand back the raw content as usual
+            return super().deserialize(content)
+        if self._data_wrapper and isinstance(body, dict) and 'data' in body:
+            body = body['data']
+        return body
+
+
 class GoogleSheetsClient:
     SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
@@ -63,7 +85,9 @@ class GoogleSheetsClient:
                     token.write(creds.to_json())
 
         self.creds = creds
-        self.service = build('sheets', 'v4', credentials=creds)
+        # model=None keeps googleapiclient's default stdlib JsonModel
+        model = OrjsonJsonModel() if ORJSON_AVAILABLE else None
+        self.service = build('sheets', 'v4', credentials=creds, model=model)
 
     def read_sheet(self, range_name='A:Z', sheet_name=None, skip_header_rows=True):
         """Read data from Google Sheet
@@ -1,7 +1,9 @@
 import os
 import asyncio
 import logging
+import re
 from datetime import datetime, timedelta
+from functools import lru_cache
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
 from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters, ContextTypes
 from google_sheets_client import GoogleSheetsClient
@@ -16,6 +18,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Hash of the last registered command menu, kept next to this module
+BOT_COMMANDS_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.botcmd_cache.json')
+
+@lru_cache(maxsize=4096)
+def format_iso_date(date_obj):
+    """Format a date object as YYYY-MM-DD (cached, the same dates recur across requests)"""
+    return date_obj.strftime('%Y-%m-%d')
+
+def compact_prompt(text):
+    """Collapse runs of blank lines in an LLM prompt to save input tokens"""
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
 class TelegramGoogleSheetsBot:
     def __init__(self, telegram_token, anthropic_key, credentials_file, spreadsheet_id):
         self.telegram_token = telegram_token
@@ -24,7 +38,7 @@ class TelegramGoogleSheetsBot:
         self.spreadsheet_id = spreadsheet_id
         self.sheets_client = None
         self.anthropic_client = None
-        self.awaiting_date_input = {}  # Track users waiting for date input
+        self.awaiting_date_input = set()  # Track users waiting for date input
         
         # Initialize Google Sheets client
         try:
@@ -1965,7 +1979,7 @@ Undelivered ({len(undelivered_orders)}):
             
         elif button_data == "date_custom":
             # For custom date, fall back to text input
-            self.awaiting_date_input[user_id] = True
+            self.awaiting_date_input.add(user_id)
             await query.edit_message_text(
                 "📅 Please specify the date or date range you want to analyze.\n\n"
                 "Examples:\n"
@@ -2407,7 +2421,8 @@ Examples:
         try:
             await update.message.reply_text("📊 Analyzing sales data for the specified date(s)...")
             
-            # Read ORDER sheet data
+            # Read ORDER sheet data on the loop thread; the shared googleapiclient
+            # service (httplib2 transport) is not thread-safe
             data = self.sheets_client.read_sheet(sheet_name='ORDER', range_name='A:AF')
             
             if not data.get('headers') or not data.get('data'):
@@ -2428,6 +2443,7 @@ Examples:
                 # Product columns
                 p_chz_col, p_sc_col, p_bbq_col, p_og_col = 13, 14, 15, 16
                 t_chz_col, t_sc_col, t_bbq_col, t_og_col = 19, 20, 21, 22
+                product_cols = (p_chz_col, p_sc_col, p_bbq_col, p_og_col, t_chz_col, t_sc_col, t_bbq_col, t_og_col)
                 
             except Exception as e:
                 await update.message.reply_text(f"❌ Error finding columns: {str(e)}")
@@ -2453,10 +2469,9 @@ Examples:
             filtered_orders = []
             total_revenue = 0
             customers = set()
-            pouches = {'Cheese': 0, 'Sour Cream': 0, 'BBQ': 0, 'Original': 0}
-            tubs = {'Cheese': 0, 'Sour Cream': 0, 'BBQ': 0, 'Original': 0}
-            paid_pouches = {'Cheese': 0, 'Sour Cream': 0, 'BBQ': 0, 'Original': 0}
-            paid_tubs = {'Cheese': 0, 'Sour Cream': 0, 'BBQ': 0, 'Original': 0}
+            # Flavor counts are kept in plain locals inside the loop; dicts are built afterwards
+            paid_p_chz = paid_p_sc = paid_p_bbq = paid_p_og = 0
+            paid_t_chz = paid_t_sc = paid_t_bbq = paid_t_og = 0
             paid_customers = []
             unpaid_customers = []
             undelivered_orders = []
@@ -2464,19 +2479,12 @@ Examples:
             
             # Filter orders by date (same logic as sales_today_command)
             for row in rows:
-                if len(row) <= 11:
+                num_cols = len(row)
+                if num_cols <= 11:
                     continue
                 
-                has_date = len(row) > 2 and str(row[2]).strip()
-                has_name = len(row) > 3 and str(row[3]).strip()
-                has_summary = len(row) > 11 and str(row[11]).strip()
-                
-                if not (has_date or has_name or has_summary):
-                    continue
-                
-                # Check if order matches target dates
-                order_date = row[date_col] if date_col < len(row) else ''
-                order_date_str = str(order_date).strip()
+                # Check if order matches target dates; other cells are only read for matches
+                order_date_str = str(row[date_col]).strip() if date_col < num_cols else ''
                 
                 is_target_date = False
                 for target_date in target_dates:
@@ -2484,20 +2492,19 @@ Examples:
                         is_target_date = True
                         break
                 
-                if is_target_date:
+                # Skip blank rows (no date, name or order summary)
+                if is_target_date and (str(row[2]).strip() or str(row[3]).strip() or str(row[11]).strip()):
                     filtered_orders.append(row)
                     
                     # Same calculation logic as sales_today_command
-                    customer_name = str(row[name_col]).strip() if name_col < len(row) and row[name_col] else 'Unknown Customer'
+                    customer_name = (str(row[name_col]).strip() if name_col < num_cols else '') or 'Unknown Customer'
                     customers.add(customer_name)
                     
                     # Revenue calculation
                     order_price = 0
                     try:
-                        price_value = row[price_col] if price_col < len(row) and row[price_col] else 0
-                        if price_value:
-                            import re
-                            price_str = str(price_value)
+                        price_str = str(row[price_col]).strip() if price_col < num_cols else ''
+                        if price_str:
                             numeric_parts = re.findall(r'[0-9.,]+', price_str)
                             if numeric_parts:
                                 clean_price = numeric_parts[0].replace(',', '')
@@ -2506,62 +2513,62 @@ Examples:
                     except (ValueError, IndexError, AttributeError):
                         pass
                     
-                    # Product quantities
-                    try:
-                        pouches['Cheese'] += int(row[p_chz_col]) if p_chz_col < len(row) and str(row[p_chz_col]).strip().isdigit() else 0
-                        pouches['Sour Cream'] += int(row[p_sc_col]) if p_sc_col < len(row) and str(row[p_sc_col]).strip().isdigit() else 0
-                        pouches['BBQ'] += int(row[p_bbq_col]) if p_bbq_col < len(row) and str(row[p_bbq_col]).strip().isdigit() else 0
-                        pouches['Original'] += int(row[p_og_col]) if p_og_col < len(row) and str(row[p_og_col]).strip().isdigit() else 0
-                        
-                        tubs['Cheese'] += int(row[t_chz_col]) if t_chz_col < len(row) and str(row[t_chz_col]).strip().isdigit() else 0
-                        tubs['Sour Cream'] += int(row[t_sc_col]) if t_sc_col < len(row) and str(row[t_sc_col]).strip().isdigit() else 0
-                        tubs['BBQ'] += int(row[t_bbq_col]) if t_bbq_col < len(row) and str(row[t_bbq_col]).strip().isdigit() else 0
-                        tubs['Original'] += int(row[t_og_col]) if t_og_col < len(row) and str(row[t_og_col]).strip().isdigit() else 0
-                    except (ValueError, IndexError):
-                        pass
-                    
                     # Payment status
-                    payment_status = str(row[payment_status_col]).strip() if payment_status_col < len(row) and row[payment_status_col] else 'Unpaid'
+                    payment_status = (str(row[payment_status_col]).strip() if payment_status_col < num_cols else '') or 'Unpaid'
                     if 'Paid' in payment_status:
                         paid_customers.append(customer_name)
                         paid_revenue += order_price
                         
+                        # Product quantities (only paid orders reach the report)
                         try:
-                            paid_pouches['Cheese'] += int(row[p_chz_col]) if p_chz_col < len(row) and str(row[p_chz_col]).strip().isdigit() else 0
-                            paid_pouches['Sour Cream'] += int(row[p_sc_col]) if p_sc_col < len(row) and str(row[p_sc_col]).strip().isdigit() else 0
-                            paid_pouches['BBQ'] += int(row[p_bbq_col]) if p_bbq_col < len(row) and str(row[p_bbq_col]).strip().isdigit() else 0
-                            paid_pouches['Original'] += int(row[p_og_col]) if p_og_col < len(row) and str(row[p_og_col]).strip().isdigit() else 0
-                            
-                            paid_tubs['Cheese'] += int(row[t_chz_col]) if t_chz_col < len(row) and str(row[t_chz_col]).strip().isdigit() else 0
-                            paid_tubs['Sour Cream'] += int(row[t_sc_col]) if t_sc_col < len(row) and str(row[t_sc_col]).strip().isdigit() else 0
-                            paid_tubs['BBQ'] += int(row[t_bbq_col]) if t_bbq_col < len(row) and str(row[t_bbq_col]).strip().isdigit() else 0
-                            paid_tubs['Original'] += int(row[t_og_col]) if t_og_col < len(row) and str(row[t_og_col]).strip().isdigit() else 0
+                            quantities = []
+                            for col in product_cols:
+                                cell = str(row[col]).strip() if col < num_cols else ''
+                                quantities.append(int(cell) if cell.isdigit() else 0)
+                            row_p_chz, row_p_sc, row_p_bbq, row_p_og, row_t_chz, row_t_sc, row_t_bbq, row_t_og = quantities
                         except (ValueError, IndexError):
-                            pass
+                            row_p_chz = row_p_sc = row_p_bbq = row_p_og = 0
+                            row_t_chz = row_t_sc = row_t_bbq = row_t_og = 0
+                        
+                        paid_p_chz += row_p_chz
+                        paid_p_sc += row_p_sc
+                        paid_p_bbq += row_p_bbq
+                        paid_p_og += row_p_og
+                        
+                        paid_t_chz += row_t_chz
+                        paid_t_sc += row_t_sc
+                        paid_t_bbq += row_t_bbq
+                        paid_t_og += row_t_og
                     else:
                         unpaid_customers.append(customer_name)
                     
                     # Delivery status
-                    delivery_status = str(row[delivery_status_col]).strip() if delivery_status_col < len(row) and row[delivery_status_col] else 'Pending'
+                    delivery_status = (str(row[delivery_status_col]).strip() if delivery_status_col < num_cols else '') or 'Pending'
                     if delivery_status != 'Delivered':
                         undelivered_orders.append(customer_name)
             
+            # Nothing sold in this period - no report to build or summarize
+            if not customers:
+                await update.message.reply_text(f"📊 No sales for {parsed_dates['readable_format']}.")
+                return
+            
+            # Build the per-flavor dicts once, after the loop
+            paid_pouches = {'Cheese': paid_p_chz, 'Sour Cream': paid_p_sc, 'BBQ': paid_p_bbq, 'Original': paid_p_og}
+            paid_tubs = {'Cheese': paid_t_chz, 'Sour Cream': paid_t_sc, 'BBQ': paid_t_bbq, 'Original': paid_t_og}
+            
             # Calculate totals
             total_paid_pouches = sum(paid_pouches.values())
             total_paid_tubs = sum(paid_tubs.values())
             
             # Format customer list
-            if customers:
-                sorted_customers = sorted(customers)
-                customer_list_items = []
-                for i, name in enumerate(sorted_customers):
-                    if name in unpaid_customers:
-                        customer_list_items.append(f"{i+1}. {name} ❌")
-                    else:
-                        customer_list_items.append(f"{i+1}. {name}")
-                customer_list = "\n".join(customer_list_items)
-            else:
-                customer_list = "None"
+            sorted_customers = sorted(customers)
+            customer_list_items = []
+            for i, name in enumerate(sorted_customers):
+                if name in unpaid_customers:
+                    customer_list_items.append(f"{i+1}. {name} ❌")
+                else:
+                    customer_list_items.append(f"{i+1}. {name}")
+            customer_list = "\n".join(customer_list_items)
             
             # Format undelivered names
             def format_numbered_names(names):
@@ -2577,10 +2584,8 @@ Examples:
             performance_data = self.get_contextual_performance(parsed_dates, paid_revenue)
             performance_text = self.format_contextual_performance(performance_data, paid_revenue)
             
-            # Get AI insights
-            structured_summary = f"""📊 Sales Report for {parsed_dates['readable_format']}
-
-💰 Revenue: ₱{paid_revenue:,.0f}/₱{total_revenue:,.0f} | 👥 {len(customers)} Customers
+            # Report body, built once and reused when splitting the reply
+            details = f"""💰 Revenue: ₱{paid_revenue:,.0f}/₱{total_revenue:,.0f} | 👥 {len(customers)} Customers
 {customer_list}
 
 ✏️ Order:
@@ -2591,81 +2596,60 @@ Cheese {paid_tubs['Cheese']} | Sour Cream {paid_tubs['Sour Cream']} | BBQ {paid_
 
 🚚 Delivery:
 Undelivered ({len(undelivered_orders)}):
-{undelivered_formatted}
-            """
+{undelivered_formatted}"""
             
-            # Get AI insights  
-            try:
-                # Check if this is partial data (less dates analyzed than originally requested)
-                from datetime import datetime
-                original_dates_count = len([d for d in parsed_dates['dates']])  
-                actual_dates_count = len(filtered_orders) if len(filtered_orders) > 0 else len([d for d in parsed_dates['dates'] if datetime.strptime(d, '%Y-%m-%d').date() <= datetime.now().date()])
-                
-                partial_note = ""
-                if "week" in parsed_dates['readable_format'].lower() or "range" in str(parsed_dates.get('type', '')):
-                    partial_note = " Note: This may be partial data if some dates in the requested period haven't occurred yet."
-                
-                # Include performance context in AI prompt
-                performance_context = f"""
-
-Performance Context:
-{performance_text}
-"""
+            # Short summary for the AI prompt; the full customer list only for small periods
+            brief = (
+                f"Sales {parsed_dates['readable_format']}: ₱{paid_revenue:,.0f}/₱{total_revenue:,.0f}, "
+                f"{len(customers)} customers, {total_paid_pouches} pouches, {total_paid_tubs} tubs, "
+                f"{len(undelivered_orders)} undelivered."
+            )
+            if len(customers) <= 20:
+                brief += f"\n\nCustomers (❌ = unpaid):\n{customer_list}"
+            
+            # Get AI insights (skip the Claude call when there is nothing to summarize)
+            if paid_revenue <= 0 and not undelivered_orders:
+                ai_insights = "No paid orders or pending deliveries for this period."
+            else:
+                try:
+                    # Check if this is partial data (less dates analyzed than originally requested)
+                    # YYYY-MM-DD strings order like dates, so compare them without parsing
+                    original_dates_count = len(parsed_dates['dates'])
+                    today_str = format_iso_date(datetime.now().date())
+                    actual_dates_count = len(filtered_orders) if filtered_orders else sum(1 for d in parsed_dates['dates'] if d <= today_str)
+                
+                    partial_note = ""
+                    if "week" in parsed_dates['readable_format'].lower() or "range" in str(parsed_dates.get('type', '')):
+                        partial_note = " Note: This may be partial data if some dates in the requested period haven't occurred yet."
+                
+                    # Include performance context in AI prompt
+                    prompt = compact_prompt(
+                        f"Give me a brief, conversational summary of sales performance for this period. Keep it concise and friendly - no recommendations needed.{partial_note}"
+                        f"\n\nPerformance Context:\n{performance_text}\n\n{brief}"
+                    )
 
-                response = self.anthropic_client.messages.create(
-                    model="claude-sonnet-4-5-20250929",
-                    max_tokens=300,
-                    messages=[{
-                        "role": "user",
-                        "content": f"Give me a brief, conversational summary of sales performance for this period. Keep it concise and friendly - no recommendations needed.{partial_note}{performance_context}\n\n{structured_summary}"
-                    }]
-                )
-                ai_insights = response.content[0].text
-            except Exception as e:
-                ai_insights = f"AI analysis unavailable: {str(e)}"
+                    response = self.anthropic_client.messages.create(
+                        model="claude-sonnet-4-5-20250929",
+                        max_tokens=300,
+                        messages=[{
+                            "role": "user",
+                            "content": prompt
+                        }]
+                    )
+                    ai_insights = response.content[0].text
+                except Exception as e:
+                    ai_insights = f"AI analysis unavailable: {str(e)}"
             
             # Create final message with contextual performance
-            final_message = f"""🎇 Sales Report — {parsed_dates['readable_format']}
+            header_insights = f"""🎇 Sales Report — {parsed_dates['readable_format']}
 
 {performance_text}
 
-{ai_insights}
-
-💰 Revenue: ₱{paid_revenue:,.0f}/₱{total_revenue:,.0f} | 👥 {len(customers)} Customers
-{customer_list}
-
-✏️ Order:
-Pouches ({total_paid_pouches})
-Cheese {paid_pouches['Cheese']} | Sour Cream {paid_pouches['Sour Cream']} | BBQ {paid_pouches['BBQ']} | Original {paid_pouches['Original']}
-Tubs ({total_paid_tubs})
-Cheese {paid_tubs['Cheese']} | Sour Cream {paid_tubs['Sour Cream']} | BBQ {paid_tubs['BBQ']} | Original {paid_tubs['Original']}
-
-🚚 Delivery:
-Undelivered ({len(undelivered_orders)}):
-{undelivered_formatted}
-"""
+{ai_insights}"""
+            final_message = f"{header_insights}\n\n{details}\n"
             
-            # Send response (split if too long)
+            # Send response (split if too long - Telegram caps messages at 4096 characters)
             if len(final_message) > 4000:
-                header_insights = f"""🎇 Sales Report — {parsed_dates['readable_format']}
-
-{performance_text}
-
-{ai_insights}"""
-                
-                details = f"""💰 Revenue: ₱{paid_revenue:,.0f}/₱{total_revenue:,.0f} | 👥 {len(customers)} Customers
-{customer_list}
-
-✏️ Order:
-Pouches ({total_paid_pouches})
-Cheese {paid_pouches['Cheese']} | Sour Cream {paid_pouches['Sour Cream']} | BBQ {paid_pouches['BBQ']} | Original {paid_pouches['Original']}
-Tubs ({total_paid_tubs})
-Cheese {paid_tubs['Cheese']} | Sour Cream {paid_tubs['Sour Cream']} | BBQ {paid_tubs['BBQ']} | Original {paid_tubs['Original']}
-
-🚚 Delivery:
-Undelivered ({len(undelivered_orders)}):
-{undelivered_formatted}"""
-                
                 await update.message.reply_text(header_insights)
                 await update.message.reply_text(details)
             else:
@@ -2689,9 +2673,9 @@ Undelivered ({len(undelivered_orders)}):
             return
 
         # Check if user is awaiting date input for custom sales analysis
-        if user_id in self.awaiting_date_input and self.awaiting_date_input[user_id]:
+        if user_id in self.awaiting_date_input:
             # Remove the user from awaiting list
-            self.awaiting_date_input[user_id] = False
+            self.awaiting_date_input.discard(user_id)
             
             # Parse the date with LLM
             await update.message.reply_text("🤖 Understanding your date request...")
@@ -2711,16 +2695,11 @@ Undelivered ({len(undelivered_orders)}):
                 # Only proceed with analysis if there's available data
                 if availability['available_count'] > 0:
                     # Filter parsed_dates to only include available dates for analysis
-                    available_date_strs = []
-                    for date_obj in availability['available_dates']:
-                        available_date_strs.append(date_obj.strftime('%Y-%m-%d'))
+                    wanted = set(parsed_dates['dates'])
+                    available = {format_iso_date(date_obj) for date_obj in availability['available_dates']}
                     
                     # Create filtered parsed_dates object
-                    filtered_parsed_dates = {
-                        'type': parsed_dates['type'],
-                        'dates': available_date_strs,
-                        'readable_format': parsed_dates['readable_format']
-                    }
+                    filtered_parsed_dates = {**parsed_dates, 'dates': sorted(wanted & available)}
                     
                     # Analyze sales for the available dates only
                     await self.analyze_sales_for_dates(update, filtered_parsed_dates)
@@ -2742,18 +2721,40 @@ Undelivered ({len(undelivered_orders)}):
         )
     
     async def setup_bot_commands(self, application):
-        """Set up the bot command menu"""
+        """Set up the bot command menu (skipped when unchanged since the last run)"""
         from telegram import BotCommand
+        import hashlib
+        import json
 
         commands = [
             BotCommand("custom", "Custom date sales analysis"),
         ]
 
+        # Compare against the commands registered on the previous startup. The token is part
+        # of the hash so switching to another bot always registers its menu
+        cache_file = BOT_COMMANDS_CACHE_FILE
+        serialized = json.dumps([self.telegram_token, [[c.command, c.description] for c in commands]])
+        new_hash = hashlib.blake2b(serialized.encode()).hexdigest()
+        try:
+            with open(cache_file, 'r') as f:
+                if json.load(f).get('hash') == new_hash:
+                    logger.info("Bot commands unchanged - skipping set_my_commands")
+                    return
+        except (OSError, ValueError, AttributeError):
+            pass  # No usable cache (missing, unreadable or malformed) - register the commands
+
         try:
             await application.bot.set_my_commands(commands)
             logger.info("Bot commands menu set successfully")
         except Exception as e:
             logger.error(f"Error setting bot commands: {e}")
+            return
+
+        try:
+            with open(cache_file, 'w') as f:
+                json.dump({'hash': new_hash}, f)
+        except OSError as e:
+            logger.warning(f"Could not write bot commands cache: {e}")
 
     async def send_scheduled_sales_report(self, application):
         """Send automated daily sales report to specified chat"""
@@ -2883,13 +2884,17 @@ def main():
         if not telegram_token or not anthropic_key:
             try:
                 with open('secret key.txt', 'r') as f:
-                    lines = f.readlines()
-                    
-                    for line in lines:
-                        if 'telegram bot:' in line.lower() and not telegram_token:
-                            telegram_token = line.split(':', 1)[1].strip()
-                        elif 'anthropic key:' in line.lower() and not anthropic_key:
-                            anthropic_key = line.split(':', 1)[1].strip()
+                    text = f.read()
+                
+                if not telegram_token:
+                    # [ \t]* keeps the match on one line; a blank "Telegram Bot:" line yields nothing
+                    match = re.search(r'(?i)telegram bot[ \t]*:[ \t]*(\S+)', text)
+                    if match:
+                        telegram_token = match.group(1)
+                if not anthropic_key:
+                    match = re.search(r'(?i)anthropic key[ \t]*:[ \t]*(\S+)', text)
+                    if match:
+                        anthropic_key = match.group(1)
             except FileNotFoundError:
                 pass  # File doesn't exist in production
         
@@ -14,15 +14,173 @@ Test Coverage:
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock, call
+from unittest.mock import Mock, MagicMock, AsyncMock, call
+from types import SimpleNamespace
+from functools import lru_cache
+import copy
 import os
 import sys
 
 # Add parent directory to path to import telegram_bot
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import telegram_bot as _tb
 from telegram_bot import TelegramGoogleSheetsBot
 
+# Objects whose attributes the tests swap, resolved once
+_anthropic_module = _tb.anthropic
+
+
+# Fixtures built once at import; tests copy or share them instead of rebuilding
+_PROTOTYPE_RESPONSE = SimpleNamespace(content=[SimpleNamespace(text="Test AI response")])
+
+# ORDER sheet layout read by analyze_sales_for_dates: named columns plus fixed product columns
+_ORDER_HEADERS = tuple({
+    2: 'Order Date', 3: 'Name', 7: 'Status Payment', 8: 'Status (Delivery)', 11: 'Order', 27: 'Price',
+}.get(col, f'Col {col}') for col in range(28))
+
+
+def _order_row(order_date, name, price, cheese_pouches=1):
+    """One paid, undelivered ORDER sheet row"""
+    row = [''] * len(_ORDER_HEADERS)
+    row[2], row[3], row[7], row[8] = order_date, name, 'Paid', 'Pending'
+    row[11], row[13], row[27] = f'{cheese_pouches} Cheese Pouch', str(cheese_pouches), price
+    return tuple(row)
+
+
+_SHEET_ROWS = (
+    _ORDER_HEADERS,
+    _order_row('2025-01-15', 'John Doe', '100'),
+)
+
+_RANGE_SHEET_ROWS = _SHEET_ROWS + (
+    _order_row('2025-01-16', 'Jane Smith', '150'),
+    _order_row('2025-01-17', 'Bob Johnson', '200'),
+)
+
+
+def _parsed_dates(date_str):
+    """parse_date_with_llm-style result for a single day"""
+    return {'dates': [date_str], 'readable_format': date_str, 'type': 'single'}
+
+OLD_MODEL_ID = "claude-3-5-sonnet-20240620"
+NEW_MODEL_ID = "claude-sonnet-4-5-20250929"
+
+
+@lru_cache(maxsize=1)
+def _bot_source():
+    """Source of the imported telegram_bot module, read on first use only"""
+    buf = bytearray(os.path.getsize(_tb.__file__))
+    with open(_tb.__file__, 'rb', buffering=0) as f:
+        f.readinto(buf)
+    return buf.decode('utf-8')
+
+
+@lru_cache(maxsize=1)
+def _model_id_scan():
+    """Old/new model ID counts and (line number, line) hits for the old ID, computed once"""
+    source = _bot_source()
+    old_hits = [(lineno, line.strip()) for lineno, line in enumerate(source.splitlines(), 1) if OLD_MODEL_ID in line]
+    return source.count(OLD_MODEL_ID), source.count(NEW_MODEL_ID), old_hits
+
+
+def _kw(call_item):
+    """Keyword arguments of a recorded mock call"""
+    return call_item.kwargs
+
+
+_TEST_ENV = {
+    'TELEGRAM_BOT_TOKEN': 'test_token_12345',
+    'ANTHROPIC_API_KEY': 'test_anthropic_key',
+    'SPREADSHEET_ID': 'test_spreadsheet_id',
+}
+# Unset so the bot builds its sheets client through GoogleSheetsClient, which the tests replace
+_UNSET_ENV = ('GOOGLE_CREDENTIALS_B64',)
+_saved_env = {}
+
+
+def setUpModule():
+    """Set the test environment variables once for the whole module"""
+    _saved_env.update({key: os.environ.get(key) for key in (*_TEST_ENV, *_UNSET_ENV)})
+    os.environ.update(_TEST_ENV)
+    for key in _UNSET_ENV:
+        os.environ.pop(key, None)
+
+
+def tearDownModule():
+    """Restore the environment variables replaced in setUpModule"""
+    for key, value in _saved_env.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
+
+@lru_cache(maxsize=1)
+def _get_bot():
+    """Build the bot once; call only while the client mocks are installed"""
+    return _build_bot()
+
+
+def _build_bot():
+    """Construct a bot from the test environment"""
+    return TelegramGoogleSheetsBot(
+        telegram_token=_TEST_ENV['TELEGRAM_BOT_TOKEN'],
+        anthropic_key=_TEST_ENV['ANTHROPIC_API_KEY'],
+        credentials_file='credentials.json',
+        spreadsheet_id=_TEST_ENV['SPREADSHEET_ID'],
+    )
+
+
+class _FakeSheets:
+    """Minimal stand-in for the Google Sheets client that returns canned rows"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.read_sheet_calls = []
+
+    def read_sheet(self, *args, **kwargs):
+        """Return the rows shaped like GoogleSheetsClient.read_sheet"""
+        self.read_sheet_calls.append((args, kwargs))
+        return {'headers': list(self.rows[0]), 'data': [list(row) for row in self.rows[1:]]}
+
+
+class BaseBotTestCase(unittest.IsolatedAsyncioTestCase):
+    """Shared client mocks, installed once per test class"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Install the client mocks once for the class"""
+        # Mock the anthropic client (plain attribute swap; the restore is registered right away
+        # so it still runs if a later step of this setUpClass raises)
+        cls.mock_anthropic_class = MagicMock()
+        cls._orig_anthropic = _anthropic_module.Anthropic
+        _anthropic_module.Anthropic = cls.mock_anthropic_class
+        cls.addClassCleanup(setattr, _anthropic_module, 'Anthropic', cls._orig_anthropic)
+
+        # Mock Google Sheets client
+        cls.mock_sheets_class = lambda *args, **kwargs: _FakeSheets(_SHEET_ROWS)
+        cls._orig_sheets = _tb.GoogleSheetsClient
+        _tb.GoogleSheetsClient = cls.mock_sheets_class
+        cls.addClassCleanup(setattr, _tb, 'GoogleSheetsClient', cls._orig_sheets)
+
+        # The bot is built once per run; assert against the clients it actually holds
+        bot = _get_bot()
+        cls.mock_anthropic_instance = bot.anthropic_client
+        cls.fake_sheets = bot.sheets_client
+
+    def setUp(self):
+        """Reset shared mock state so each test starts clean"""
+        self.mock_anthropic_instance.reset_mock(return_value=True, side_effect=True)
+        self.fake_sheets.rows = _SHEET_ROWS
+        self.fake_sheets.read_sheet_calls.clear()
+
+    async def analyze(self, bot, date_str):
+        """Run analyze_sales_for_dates for one day and return the last reply sent"""
+        update = SimpleNamespace(message=SimpleNamespace(reply_text=AsyncMock()))
+        await bot.analyze_sales_for_dates(update, _parsed_dates(date_str))
+        return update.message.reply_text.await_args.args[0]
+
 
 class TestAIModelConfiguration(unittest.TestCase):
     """Test AI model configuration and model ID usage"""
@@ -33,42 +191,9 @@ class TestAIModelConfiguration(unittest.TestCase):
     # Old model ID that should NOT be present
     OLD_MODEL_ID = "claude-3-5-sonnet-20240620"
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.env_patcher = patch.dict(os.environ, {
-            'TELEGRAM_BOT_TOKEN': 'test_token_12345',
-            'ANTHROPIC_API_KEY': 'test_anthropic_key',
-            'SPREADSHEET_ID': 'test_spreadsheet_id',
-            'GOOGLE_CREDENTIALS_B64': 'dGVzdF9jcmVkZW50aWFscw==',
-        })
-        self.env_patcher.start()
-
-        # Mock the anthropic client
-        self.anthropic_patcher = patch('telegram_bot.anthropic.Anthropic')
-        self.mock_anthropic_class = self.anthropic_patcher.start()
-        self.mock_anthropic_instance = MagicMock()
-        self.mock_anthropic_class.return_value = self.mock_anthropic_instance
-
-        # Mock Google Sheets client
-        self.sheets_patcher = patch('telegram_bot.GoogleSheetsClient')
-        self.mock_sheets = self.sheets_patcher.start()
-
-    def tearDown(self):
-        """Clean up after tests"""
-        self.env_patcher.stop()
-        self.anthropic_patcher.stop()
-        self.sheets_patcher.stop()
-
     def test_model_id_not_old_version(self):
         """Test that old model ID is NOT used anywhere in the codebase"""
-        # Read the telegram_bot.py file to check for old model ID
-        bot_file_path = os.path.join(os.path.dirname(__file__), 'telegram_bot.py')
-
-        with open(bot_file_path, 'r') as f:
-            content = f.read()
-
-        # Count occurrences of old model ID
-        old_model_count = content.count(self.OLD_MODEL_ID)
+        old_model_count, _, _ = _model_id_scan()
 
         # This test will fail if the old model ID is still present
         # This helps verify the upgrade was completed
@@ -78,14 +203,7 @@ class TestAIModelConfiguration(unittest.TestCase):
 
     def test_model_id_updated_to_sonnet_45(self):
         """Test that new Sonnet 4.5 model ID is present in the codebase"""
-        # Read the telegram_bot.py file to check for new model ID
-        bot_file_path = os.path.join(os.path.dirname(__file__), 'telegram_bot.py')
-
-        with open(bot_file_path, 'r') as f:
-            content = f.read()
-
-        # Check for new model ID
-        new_model_count = content.count(self.EXPECTED_MODEL_ID)
+        _, new_model_count, _ = _model_id_scan()
 
         # Should have multiple occurrences (one for each API call location)
         self.assertGreater(new_model_count, 0,
@@ -97,54 +215,25 @@ class TestAIModelConfiguration(unittest.TestCase):
                                f"Expected at least 5 occurrences of new model ID, found {new_model_count}")
 
 
-class TestAIModelAPIIntegration(unittest.TestCase):
-    """Test AI model integration with Anthropic API"""
+class TestAIModelBehavior(BaseBotTestCase):
+    """Test AI model API integration, response handling and regressions"""
 
     EXPECTED_MODEL_ID = "claude-sonnet-4-5-20250929"
 
     def setUp(self):
         """Set up test fixtures"""
-        self.env_patcher = patch.dict(os.environ, {
-            'TELEGRAM_BOT_TOKEN': 'test_token_12345',
-            'ANTHROPIC_API_KEY': 'test_anthropic_key',
-            'SPREADSHEET_ID': 'test_spreadsheet_id',
-            'GOOGLE_CREDENTIALS_B64': 'dGVzdF9jcmVkZW50aWFscw==',
-        })
-        self.env_patcher.start()
-
-        self.anthropic_patcher = patch('telegram_bot.anthropic.Anthropic')
-        self.mock_anthropic_class = self.anthropic_patcher.start()
-        self.mock_anthropic_instance = MagicMock()
-        self.mock_anthropic_class.return_value = self.mock_anthropic_instance
+        super().setUp()
 
         # Set up mock response
-        mock_response = MagicMock()
-        mock_response.content = [MagicMock(text="Test AI response")]
-        self.mock_anthropic_instance.messages.create.return_value = mock_response
-
-        self.sheets_patcher = patch('telegram_bot.GoogleSheetsClient')
-        self.mock_sheets_class = self.sheets_patcher.start()
-        self.mock_sheets_instance = MagicMock()
-        self.mock_sheets_class.return_value = self.mock_sheets_instance
+        self.mock_response = copy.copy(_PROTOTYPE_RESPONSE)
+        self.mock_anthropic_instance.messages.create.return_value = self.mock_response
 
-        # Mock sheets data
-        self.mock_sheets_instance.read_sheet.return_value = [
-            ['Date', 'Customer', 'Product', 'Amount', 'Status'],
-            ['2025-01-15', 'John Doe', 'Cheese Pouch', '100', 'Paid']
-        ]
-
-    def tearDown(self):
-        """Clean up after tests"""
-        self.env_patcher.stop()
-        self.anthropic_patcher.stop()
-        self.sheets_patcher.stop()
-
-    def test_api_call_uses_correct_model_id(self):
+    async def test_api_call_uses_correct_model_id(self):
         """Test that API calls use the correct Sonnet 4.5 model ID"""
-        bot = TelegramGoogleSheetsBot()
+        bot = _get_bot()
 
         # Trigger an analysis that uses the AI model
-        result = bot.analyze_sales_for_dates('2025-01-15', '2025-01-15')
+        result = await self.analyze(bot, '2025-01-15')
 
         # Verify the anthropic client was called
         self.mock_anthropic_instance.messages.create.assert_called()
@@ -154,7 +243,7 @@ class TestAIModelAPIIntegration(unittest.TestCase):
 
         # Verify each call uses the correct model
         for call_item in calls:
-            call_kwargs = call_item.kwargs if call_item.kwargs else call_item[1]
+            call_kwargs = _kw(call_item)
 
             # Check model parameter
             self.assertIn('model', call_kwargs,
@@ -167,11 +256,11 @@ class TestAIModelAPIIntegration(unittest.TestCase):
                            f"Expected model '{self.EXPECTED_MODEL_ID}', "
                            f"but got '{actual_model}'. Model needs to be upgraded.")
 
-    def test_api_request_parameters_valid(self):
+    async def test_api_request_parameters_valid(self):
         """Test that API requests include all required parameters"""
-        bot = TelegramGoogleSheetsBot()
+        bot = _get_bot()
 
-        result = bot.analyze_sales_for_dates('2025-01-15', '2025-01-15')
+        result = await self.analyze(bot, '2025-01-15')
 
         # Verify the anthropic client was called
         self.mock_anthropic_instance.messages.create.assert_called()
@@ -196,18 +285,19 @@ class TestAIModelAPIIntegration(unittest.TestCase):
         self.assertIsInstance(call_kwargs['messages'], list)
         self.assertGreater(len(call_kwargs['messages']), 0)
 
-    def test_token_limits_configuration(self):
+    async def test_token_limits_configuration(self):
         """Test that token limits are appropriately configured for different use cases"""
-        bot = TelegramGoogleSheetsBot()
+        bot = _get_bot()
 
         # Trigger analysis
-        result = bot.analyze_sales_for_dates('2025-01-15', '2025-01-15')
+        result = await self.analyze(bot, '2025-01-15')
 
         # Get all API calls
         calls = self.mock_anthropic_instance.messages.create.call_args_list
+        self.assertTrue(calls, "Analysis should call the AI model")
 
         for call_item in calls:
-            call_kwargs = call_item.kwargs if call_item.kwargs else call_item[1]
+            call_kwargs = _kw(call_item)
 
             # Verify max_tokens is reasonable (between 100 and 1000 for this use case)
             max_tokens = call_kwargs.get('max_tokens', 0)
@@ -216,54 +306,17 @@ class TestAIModelAPIIntegration(unittest.TestCase):
             self.assertLessEqual(max_tokens, 1000,
                                 "max_tokens should not exceed 1000 for summary tasks")
 
+    # Response handling
 
-class TestAIModelResponseHandling(unittest.TestCase):
-    """Test AI model response handling and compatibility"""
-
-    EXPECTED_MODEL_ID = "claude-sonnet-4-5-20250929"
-
-    def setUp(self):
-        """Set up test fixtures"""
-        self.env_patcher = patch.dict(os.environ, {
-            'TELEGRAM_BOT_TOKEN': 'test_token_12345',
-            'ANTHROPIC_API_KEY': 'test_anthropic_key',
-            'SPREADSHEET_ID': 'test_spreadsheet_id',
-            'GOOGLE_CREDENTIALS_B64': 'dGVzdF9jcmVkZW50aWFscw==',
-        })
-        self.env_patcher.start()
-
-        self.anthropic_patcher = patch('telegram_bot.anthropic.Anthropic')
-        self.mock_anthropic_class = self.anthropic_patcher.start()
-        self.mock_anthropic_instance = MagicMock()
-        self.mock_anthropic_class.return_value = self.mock_anthropic_instance
-
-        self.sheets_patcher = patch('telegram_bot.GoogleSheetsClient')
-        self.mock_sheets_class = self.sheets_patcher.start()
-        self.mock_sheets_instance = MagicMock()
-        self.mock_sheets_class.return_value = self.mock_sheets_instance
-
-        # Mock sheets data
-        self.mock_sheets_instance.read_sheet.return_value = [
-            ['Date', 'Customer', 'Product', 'Amount', 'Status'],
-            ['2025-01-15', 'John Doe', 'Cheese Pouch', '100', 'Paid']
-        ]
-
-    def tearDown(self):
-        """Clean up after tests"""
-        self.env_patcher.stop()
-        self.anthropic_patcher.stop()
-        self.sheets_patcher.stop()
-
-    def test_successful_response_handling(self):
+    async def test_successful_response_handling(self):
         """Test that successful AI responses are handled correctly"""
-        bot = TelegramGoogleSheetsBot()
+        bot = _get_bot()
 
         # Mock successful response
-        mock_response = MagicMock()
-        mock_response.content = [MagicMock(text="Strong sales performance today!")]
+        mock_response = SimpleNamespace(content=[SimpleNamespace(text="Strong sales performance today!")])
         self.mock_anthropic_instance.messages.create.return_value = mock_response
 
-        result = bot.analyze_sales_for_dates('2025-01-15', '2025-01-15')
+        result = await self.analyze(bot, '2025-01-15')
 
         # Verify result is not None
         self.assertIsNotNone(result, "Should receive a valid response")
@@ -271,142 +324,74 @@ class TestAIModelResponseHandling(unittest.TestCase):
         # Verify result is a string
         self.assertIsInstance(result, str, "Response should be a string")
 
-    def test_empty_response_handling(self):
+    async def test_empty_response_handling(self):
         """Test handling of empty AI responses"""
-        bot = TelegramGoogleSheetsBot()
+        bot = _get_bot()
 
         # Mock empty response
-        mock_response = MagicMock()
-        mock_response.content = [MagicMock(text="")]
+        mock_response = SimpleNamespace(content=[SimpleNamespace(text="")])
         self.mock_anthropic_instance.messages.create.return_value = mock_response
 
-        result = bot.analyze_sales_for_dates('2025-01-15', '2025-01-15')
+        result = await self.analyze(bot, '2025-01-15')
 
         # Should still return a result (with fallback or data only)
         self.assertIsNotNone(result)
 
-    def test_api_error_handling(self):
+    async def test_api_error_handling(self):
         """Test error handling when API call fails"""
-        bot = TelegramGoogleSheetsBot()
+        bot = _get_bot()
 
         # Mock API error
         self.mock_anthropic_instance.messages.create.side_effect = Exception("API Error")
 
         # Should not crash, should handle gracefully
-        result = bot.analyze_sales_for_dates('2025-01-15', '2025-01-15')
+        result = await self.analyze(bot, '2025-01-15')
 
         # Should return some result even without AI insights
         self.assertIsNotNone(result, "Should handle API errors gracefully")
 
-    def test_response_text_extraction(self):
+    async def test_response_text_extraction(self):
         """Test that response text is correctly extracted from API response"""
-        bot = TelegramGoogleSheetsBot()
+        bot = _get_bot()
 
         # Mock response with specific text
         expected_text = "Sales are up 25% from last week!"
-        mock_response = MagicMock()
-        mock_response.content = [MagicMock(text=expected_text)]
+        mock_response = SimpleNamespace(content=[SimpleNamespace(text=expected_text)])
         self.mock_anthropic_instance.messages.create.return_value = mock_response
 
-        result = bot.analyze_sales_for_dates('2025-01-15', '2025-01-15')
+        result = await self.analyze(bot, '2025-01-15')
 
         # Result should contain the AI insight
         self.assertIn(expected_text, result,
                      "Result should include AI-generated insight")
 
-
-class TestModelUpgradeRegressionChecks(unittest.TestCase):
-    """Regression tests to ensure model upgrade doesn't break existing functionality"""
-
-    def setUp(self):
-        """Set up test fixtures"""
-        self.env_patcher = patch.dict(os.environ, {
-            'TELEGRAM_BOT_TOKEN': 'test_token_12345',
-            'ANTHROPIC_API_KEY': 'test_anthropic_key',
-            'SPREADSHEET_ID': 'test_spreadsheet_id',
-            'GOOGLE_CREDENTIALS_B64': 'dGVzdF9jcmVkZW50aWFscw==',
-        })
-        self.env_patcher.start()
-
-        self.anthropic_patcher = patch('telegram_bot.anthropic.Anthropic')
-        self.mock_anthropic_class = self.anthropic_patcher.start()
-        self.mock_anthropic_instance = MagicMock()
-        self.mock_anthropic_class.return_value = self.mock_anthropic_instance
-
-        # Mock successful response
-        mock_response = MagicMock()
-        mock_response.content = [MagicMock(text="Good sales today!")]
-        self.mock_anthropic_instance.messages.create.return_value = mock_response
-
-        self.sheets_patcher = patch('telegram_bot.GoogleSheetsClient')
-        self.mock_sheets_class = self.sheets_patcher.start()
-        self.mock_sheets_instance = MagicMock()
-        self.mock_sheets_class.return_value = self.mock_sheets_instance
-
-        # Mock sheets data
-        self.mock_sheets_instance.read_sheet.return_value = [
-            ['Date', 'Customer', 'Product', 'Amount', 'Status'],
-            ['2025-01-15', 'John Doe', 'Cheese Pouch', '100', 'Paid'],
-            ['2025-01-15', 'Jane Smith', 'BBQ Pouch', '150', 'Paid']
-        ]
-
-    def tearDown(self):
-        """Clean up after tests"""
-        self.env_patcher.stop()
-        self.anthropic_patcher.stop()
-        self.sheets_patcher.stop()
-
-    def test_single_date_analysis_still_works(self):
-        """Test that single date analysis works with new model"""
-        bot = TelegramGoogleSheetsBot()
-
-        result = bot.analyze_sales_for_dates('2025-01-15', '2025-01-15')
-
-        self.assertIsNotNone(result)
-        self.assertIsInstance(result, str)
-        self.assertGreater(len(result), 0)
-
-    def test_date_range_analysis_still_works(self):
-        """Test that date range analysis works with new model"""
-        bot = TelegramGoogleSheetsBot()
-
-        # Mock sheets data for multiple dates
-        self.mock_sheets_instance.read_sheet.return_value = [
-            ['Date', 'Customer', 'Product', 'Amount', 'Status'],
-            ['2025-01-15', 'John Doe', 'Cheese Pouch', '100', 'Paid'],
-            ['2025-01-16', 'Jane Smith', 'BBQ Pouch', '150', 'Paid'],
-            ['2025-01-17', 'Bob Johnson', 'Original Pouch', '200', 'Paid']
-        ]
-
-        result = bot.analyze_sales_for_dates('2025-01-15', '2025-01-17')
-
-        self.assertIsNotNone(result)
-        self.assertIsInstance(result, str)
-        self.assertGreater(len(result), 0)
+    # Regression checks: the upgrade must not break existing functionality
 
     def test_bot_initialization_successful(self):
         """Test that bot initializes successfully with new model"""
         try:
-            bot = TelegramGoogleSheetsBot()
+            bot = _build_bot()
             self.assertIsNotNone(bot)
             self.assertIsNotNone(bot.anthropic_client)
         except Exception as e:
             self.fail(f"Bot initialization failed: {e}")
 
-    def test_multiple_ai_calls_all_use_new_model(self):
+    async def test_multiple_ai_calls_all_use_new_model(self):
         """Test that multiple AI calls all use the correct model"""
-        bot = TelegramGoogleSheetsBot()
+        bot = _get_bot()
+        self.fake_sheets.rows = _RANGE_SHEET_ROWS
 
         # Make multiple analysis calls
-        bot.analyze_sales_for_dates('2025-01-15', '2025-01-15')
-        bot.analyze_sales_for_dates('2025-01-16', '2025-01-16')
+        await self.analyze(bot, '2025-01-15')
+        await self.analyze(bot, '2025-01-16')
 
         # Get all calls
         calls = self.mock_anthropic_instance.messages.create.call_args_list
+        self.assertEqual(len(calls), 2, "Each analysis should call the AI model once")
 
         # Verify all calls use the correct model
         for call_item in calls:
-            call_kwargs = call_item.kwargs if call_item.kwargs else call_item[1]
+            call_kwargs = _kw(call_item)
             self.assertEqual(call_kwargs['model'], "claude-sonnet-4-5-20250929",
                            "All API calls should use Sonnet 4.5 model")
 
@@ -416,16 +401,7 @@ class TestModelIDConsistency(unittest.TestCase):
 
     def test_no_hardcoded_old_model_ids(self):
         """Test that no hardcoded old model IDs exist in the code"""
-        bot_file_path = os.path.join(os.path.dirname(__file__), 'telegram_bot.py')
-
-        with open(bot_file_path, 'r') as f:
-            lines = f.readlines()
-
-        # Look for old model ID in each line
-        lines_with_old_model = []
-        for i, line in enumerate(lines, 1):
-            if 'claude-3-5-sonnet-20240620' in line:
-                lines_with_old_model.append((i, line.strip()))
+        _, _, lines_with_old_model = _model_id_scan()
 
         # Fail if any old model IDs found
         if lines_with_old_model:
@@ -437,31 +413,30 @@ class TestModelIDConsistency(unittest.TestCase):
 
     def test_new_model_id_present(self):
         """Test that new model ID is present in the code"""
-        bot_file_path = os.path.join(os.path.dirname(__file__), 'telegram_bot.py')
+        _, new_model_count, _ = _model_id_scan()
+        self.assertGreater(new_model_count, 0,
+                          "New model ID 'claude-sonnet-4-5-20250929' should be present in the code")
 
-        with open(bot_file_path, 'r') as f:
-            content = f.read()
 
-        # Check for new model ID
-        self.assertIn('claude-sonnet-4-5-20250929', content,
-                     "New model ID 'claude-sonnet-4-5-20250929' should be present in the code")
+# All test classes, loaded once at import. The tests are kept as a flat tuple
+# because a TestSuite drops its tests after running; a fresh suite wraps them per run.
+_ALL_TEST_CASES = (
+    TestAIModelConfiguration,
+    TestAIModelBehavior,
+    TestModelIDConsistency,
+)
+_ALL_TESTS = tuple(
+    test
+    for test_case in _ALL_TEST_CASES
+    for test in unittest.defaultTestLoader.loadTestsFromTestCase(test_case)
+)
 
 
 def run_tests():
     """Run all test suites"""
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-
-    # Add all test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestAIModelConfiguration))
-    suite.addTests(loader.loadTestsFromTestCase(TestAIModelAPIIntegration))
-    suite.addTests(loader.loadTestsFromTestCase(TestAIModelResponseHandling))
-    suite.addTests(loader.loadTestsFromTestCase(TestModelUpgradeRegressionChecks))
-    suite.addTests(loader.loadTestsFromTestCase(TestModelIDConsistency))
-
     # Run tests with detailed output
     runner = unittest.TextTestRunner(verbosity=2)
-    result = runner.run(suite)
+    result = runner.run(unittest.TestSuite(_ALL_TESTS))
 
     return result
 
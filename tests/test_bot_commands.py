@@ -0,0 +1,144 @@
+"""
+Test Suite for the Bot Command Menu Cache
+
+This test suite validates that setup_bot_commands only calls set_my_commands
+when the command menu (or the bot it belongs to) changed since the last
+successful registration, and that cache problems never abort startup.
+
+Test Coverage:
+- Cache miss and cache hit
+- Token change forcing re-registration
+- Failed set_my_commands leaving no cache behind
+- Unreadable and unwritable cache files
+"""
+
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+
+# Add parent directory to path to import telegram_bot
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import telegram_bot
+from telegram_bot import TelegramGoogleSheetsBot
+
+
+class _StubBot:
+    """Telegram bot stand-in that records set_my_commands calls"""
+
+    def __init__(self, error=None):
+        self.calls = []
+        self.error = error
+
+    async def set_my_commands(self, commands):
+        if self.error is not None:
+            raise self.error
+        self.calls.append(commands)
+
+
+class _StubApp:
+    """Application stand-in exposing only .bot"""
+
+    def __init__(self, error=None):
+        self.bot = _StubBot(error)
+
+
+def make_bot(token='test_token_12345'):
+    """Build a TelegramGoogleSheetsBot without clients; setup_bot_commands only needs the token"""
+    bot = TelegramGoogleSheetsBot.__new__(TelegramGoogleSheetsBot)
+    bot.telegram_token = token
+    return bot
+
+
+class TestBotCommandsCache(unittest.IsolatedAsyncioTestCase):
+    """Test the set_my_commands skip cache"""
+
+    def setUp(self):
+        """Point the cache at a fresh temporary directory"""
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.cache_file = os.path.join(tmp_dir.name, '.botcmd_cache.json')
+
+        cache_patcher = patch.object(telegram_bot, 'BOT_COMMANDS_CACHE_FILE', self.cache_file)
+        cache_patcher.start()
+        self.addCleanup(cache_patcher.stop)
+
+    async def test_cache_miss_registers_and_writes_cache(self):
+        """Test that a missing cache registers the commands and records them"""
+        app = _StubApp()
+
+        await make_bot().setup_bot_commands(app)
+
+        self.assertEqual(len(app.bot.calls), 1)
+        self.assertEqual([c.command for c in app.bot.calls[0]], ['custom'])
+        self.assertTrue(os.path.exists(self.cache_file))
+
+    async def test_cache_hit_skips_registration(self):
+        """Test that an unchanged menu for the same bot is not registered again"""
+        await make_bot().setup_bot_commands(_StubApp())
+        app = _StubApp()
+
+        await make_bot().setup_bot_commands(app)
+
+        self.assertEqual(app.bot.calls, [])
+
+    async def test_token_change_registers_again(self):
+        """Test that switching to another bot token registers its menu"""
+        await make_bot('first_token').setup_bot_commands(_StubApp())
+        app = _StubApp()
+
+        await make_bot('second_token').setup_bot_commands(app)
+
+        self.assertEqual(len(app.bot.calls), 1)
+
+    async def test_failed_registration_writes_no_cache(self):
+        """Test that a failed set_my_commands leaves no cache, so the next start retries"""
+        await make_bot().setup_bot_commands(_StubApp(error=Exception("Network error")))
+
+        self.assertFalse(os.path.exists(self.cache_file))
+
+        app = _StubApp()
+        await make_bot().setup_bot_commands(app)
+        self.assertEqual(len(app.bot.calls), 1)
+
+    async def test_malformed_cache_registers(self):
+        """Test that a cache file that is not valid JSON is ignored"""
+        with open(self.cache_file, 'w') as f:
+            f.write('not json')
+        app = _StubApp()
+
+        await make_bot().setup_bot_commands(app)
+
+        self.assertEqual(len(app.bot.calls), 1)
+
+    async def test_unusable_cache_path_does_not_abort(self):
+        """Test that an unreadable/unwritable cache path still registers and does not raise"""
+        # A directory at the cache path makes both the read and the write raise OSError
+        os.mkdir(self.cache_file)
+        app = _StubApp()
+
+        await make_bot().setup_bot_commands(app)
+
+        self.assertEqual(len(app.bot.calls), 1)
+
+
+def run_tests():
+    """Run all test suites"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    # Add all test classes
+    suite.addTests(loader.loadTestsFromTestCase(TestBotCommandsCache))
+
+    # Run tests with detailed output
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return result
+
+
+if __name__ == '__main__':
+    result = run_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
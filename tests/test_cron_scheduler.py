@@ -2,11 +2,11 @@
 Comprehensive Test Suite for Cron Job Scheduling Feature
 
 This test suite validates the scheduled report functionality that sends
-automated sales reports at 3 PM and 11 PM daily.
+automated sales reports at 3 PM, 7 PM and 11 PM daily.
 
 Test Coverage:
 - Cron job configuration correctness
-- Schedule timing verification (3 PM and 11 PM)
+- Schedule timing verification (3 PM, 7 PM and 11 PM)
 - Timezone handling
 - Scheduler initialization
 - Job registration and execution
@@ -14,76 +14,142 @@ Test Coverage:
 """
 
 import unittest
-from unittest.mock import Mock, patch, MagicMock, AsyncMock, call
+import asyncio
+from unittest.mock import Mock, patch, MagicMock, call
 from datetime import datetime, time
 import pytz
 import os
 import sys
 
 # Add parent directory to path to import telegram_bot
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from telegram_bot import TelegramGoogleSheetsBot
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 
-class TestCronSchedulerConfiguration(unittest.TestCase):
-    """Test the cron scheduler configuration and setup"""
+_TEST_ENV = {
+    'TELEGRAM_BOT_TOKEN': 'test_token_12345',
+    'ANTHROPIC_API_KEY': 'test_anthropic_key',
+    'SPREADSHEET_ID': 'test_spreadsheet_id',
+    'GOOGLE_CREDENTIALS_B64': 'dGVzdF9jcmVkZW50aWFscw==',  # base64 of 'test_credentials'
+    'TIMEZONE': 'Asia/Manila',
+    'REPORT_CHAT_ID': '123456789'
+}
+
+
+class _FixedDatetime(datetime):
+    """datetime whose now() is pinned to 2025-03-15 15:00"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 3, 15, 15, 0, 0, tzinfo=tz)
+
+
+def _zone_name(tzinfo):
+    """IANA name of a scheduler timezone; APScheduler 3.10 keeps pytz zones, 3.11 converts them to zoneinfo"""
+    return str(tzinfo)
+
+
+class _BotTestBase:
+    """Mixin that starts the env and client patches once per test class"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the shared patches; addClassCleanup stops them after the class"""
+        super().setUpClass()
 
-    def setUp(self):
-        """Set up test fixtures"""
         # Mock environment variables
-        self.env_patcher = patch.dict(os.environ, {
-            'TELEGRAM_BOT_TOKEN': 'test_token_12345',
-            'ANTHROPIC_API_KEY': 'test_anthropic_key',
-            'SPREADSHEET_ID': 'test_spreadsheet_id',
-            'GOOGLE_CREDENTIALS_B64': 'dGVzdF9jcmVkZW50aWFscw==',  # base64 of 'test_credentials'
-            'TIMEZONE': 'Asia/Manila',
-            'REPORT_CHAT_ID': '123456789'
-        })
-        self.env_patcher.start()
+        cls.env_patcher = patch.dict(os.environ, _TEST_ENV)
+        cls.env_patcher.start()
+        cls.addClassCleanup(cls.env_patcher.stop)
 
         # Mock the anthropic client
-        self.anthropic_patcher = patch('telegram_bot.anthropic.Anthropic')
-        self.mock_anthropic = self.anthropic_patcher.start()
+        cls.anthropic_patcher = patch('telegram_bot.anthropic.Anthropic')
+        cls.mock_anthropic = cls.anthropic_patcher.start()
+        cls.addClassCleanup(cls.anthropic_patcher.stop)
 
         # Mock Google Sheets client
-        self.sheets_patcher = patch('telegram_bot.GoogleSheetsClient')
-        self.mock_sheets = self.sheets_patcher.start()
-
-    def tearDown(self):
-        """Clean up after tests"""
-        self.env_patcher.stop()
-        self.anthropic_patcher.stop()
-        self.sheets_patcher.stop()
+        cls.sheets_patcher = patch('telegram_bot.GoogleSheetsClient')
+        cls.mock_sheets = cls.sheets_patcher.start()
+        cls.addClassCleanup(cls.sheets_patcher.stop)
 
-    def test_scheduler_initialization(self):
-        """Test that scheduler is properly initialized"""
-        bot = TelegramGoogleSheetsBot(
+        # One bot per class; everything it reads from the env is read at call time
+        cls.bot = TelegramGoogleSheetsBot(
             telegram_token='test_token',
             anthropic_key='test_key',
             credentials_file=None,
             spreadsheet_id='test_id'
         )
-        mock_app = Mock()
 
-        scheduler = bot.setup_scheduler(mock_app)
 
+class _StubBot:
+    """Telegram bot stand-in that records send_message kwargs"""
+
+    def __init__(self):
+        self.calls = []
+        self.error = None
+
+    async def send_message(self, **kwargs):
+        if self.error is not None:
+            raise self.error
+        self.calls.append(kwargs)
+
+
+class _StubApp:
+    """Application stand-in exposing only .bot"""
+
+    def __init__(self):
+        self.bot = _StubBot()
+
+
+class _AsyncBotTestBase(_BotTestBase, unittest.IsolatedAsyncioTestCase):
+    """Async variant that gives each test a fresh stub app and analysis stub"""
+
+    async def asyncSetUp(self):
+        """Reset the per-test stubs on the shared bot and build a fresh application"""
+        self.bot.analyze_sales_for_dates = Mock()
+        self.app = _StubApp()
+
+
+class TestCronSchedulerConfiguration(_BotTestBase, unittest.TestCase):
+    """Test the cron scheduler configuration and setup"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the bot and scheduler once; tests assert against the cached jobs"""
+        super().setUpClass()
+
+        # AsyncIOScheduler.start() needs a running loop; registered first so it closes last
+        cls.loop = asyncio.new_event_loop()
+        cls.addClassCleanup(cls.loop.close)
+
+        cls.mock_app = Mock()
+        cls.scheduler = cls.start_scheduler(cls.mock_app)
+        cls.addClassCleanup(cls.scheduler.shutdown)
+        cls.jobs = list(cls.scheduler.get_jobs())
+        # Only introspected from here on; pausing stops further wakeups
+        cls.scheduler.pause()
+        cls.jobs_by_id = {job.id: job for job in cls.jobs}
+
+    @classmethod
+    def start_scheduler(cls, application):
+        """Run setup_scheduler inside the class event loop and return the started scheduler"""
+        async def setup():
+            return cls.bot.setup_scheduler(application)
+
+        return cls.loop.run_until_complete(setup())
+
+    def test_scheduler_initialization(self):
+        """Test that scheduler is properly initialized"""
         # Verify scheduler is created
-        self.assertIsNotNone(scheduler)
-        self.assertIsInstance(scheduler, AsyncIOScheduler)
+        self.assertIsNotNone(self.scheduler)
+        self.assertIsInstance(self.scheduler, AsyncIOScheduler)
 
     def test_cron_job_3pm_configuration(self):
         """Test that 3 PM cron job is configured correctly"""
-        bot = TelegramGoogleSheetsBot()
-        mock_app = Mock()
-
-        scheduler = bot.setup_scheduler(mock_app)
-
-        # Get the 3 PM job
-        jobs = scheduler.get_jobs()
-        pm3_job = next((job for job in jobs if job.id == 'sales_report_3pm'), None)
+        pm3_job = self.jobs_by_id.get('sales_report_3pm')
 
         # Verify job exists
         self.assertIsNotNone(pm3_job, "3 PM job should be registered")
@@ -101,14 +167,7 @@ class TestCronSchedulerConfiguration(unittest.TestCase):
 
     def test_cron_job_11pm_configuration(self):
         """Test that 11 PM cron job is configured correctly"""
-        bot = TelegramGoogleSheetsBot()
-        mock_app = Mock()
-
-        scheduler = bot.setup_scheduler(mock_app)
-
-        # Get the 11 PM job
-        jobs = scheduler.get_jobs()
-        pm11_job = next((job for job in jobs if job.id == 'sales_report_11pm'), None)
+        pm11_job = self.jobs_by_id.get('sales_report_11pm')
 
         # Verify job exists
         self.assertIsNotNone(pm11_job, "11 PM job should be registered")
@@ -124,280 +183,160 @@ class TestCronSchedulerConfiguration(unittest.TestCase):
         self.assertEqual(str(trigger_fields[5]), '23', "Hour should be 23 (11 PM)")
         self.assertEqual(str(trigger_fields[6]), '0', "Minute should be 0")
 
-    def test_both_cron_jobs_registered(self):
-        """Test that both cron jobs (3 PM and 11 PM) are registered"""
-        bot = TelegramGoogleSheetsBot()
-        mock_app = Mock()
-
-        scheduler = bot.setup_scheduler(mock_app)
-        jobs = scheduler.get_jobs()
-
-        # Verify we have exactly 2 jobs
-        self.assertEqual(len(jobs), 2, "Should have exactly 2 scheduled jobs")
+    def test_all_cron_jobs_registered(self):
+        """Test that all cron jobs (3 PM, 7 PM and 11 PM) are registered"""
+        # Verify we have exactly 3 jobs
+        self.assertEqual(len(self.jobs), 3, "Should have exactly 3 scheduled jobs")
 
-        # Verify both job IDs exist
-        job_ids = [job.id for job in jobs]
-        self.assertIn('sales_report_3pm', job_ids, "3 PM job should be registered")
-        self.assertIn('sales_report_11pm', job_ids, "11 PM job should be registered")
+        # Verify all job IDs exist
+        self.assertIn('sales_report_3pm', self.jobs_by_id, "3 PM job should be registered")
+        self.assertIn('sales_report_7pm', self.jobs_by_id, "7 PM job should be registered")
+        self.assertIn('sales_report_11pm', self.jobs_by_id, "11 PM job should be registered")
 
     def test_timezone_configuration_default(self):
         """Test default timezone configuration (Asia/Manila)"""
-        bot = TelegramGoogleSheetsBot()
-        mock_app = Mock()
-
-        scheduler = bot.setup_scheduler(mock_app)
-
         # Verify scheduler timezone
-        expected_tz = pytz.timezone('Asia/Manila')
-        self.assertEqual(scheduler.timezone, expected_tz)
+        self.assertEqual(_zone_name(self.scheduler.timezone), 'Asia/Manila')
 
     def test_timezone_configuration_custom(self):
         """Test custom timezone configuration"""
         with patch.dict(os.environ, {'TIMEZONE': 'America/New_York'}):
-            bot = TelegramGoogleSheetsBot()
             mock_app = Mock()
 
-            scheduler = bot.setup_scheduler(mock_app)
+            scheduler = self.start_scheduler(mock_app)
 
             # Verify scheduler timezone
-            expected_tz = pytz.timezone('America/New_York')
-            self.assertEqual(scheduler.timezone, expected_tz)
+            self.assertEqual(_zone_name(scheduler.timezone), 'America/New_York')
+            scheduler.shutdown()
 
-    def test_timezone_job_trigger_alignment(self):
-        """Test that cron job triggers use the correct timezone"""
-        bot = TelegramGoogleSheetsBot()
-        mock_app = Mock()
-
-        scheduler = bot.setup_scheduler(mock_app)
-        jobs = scheduler.get_jobs()
+    def test_job_invariants(self):
+        """Test each job's trigger timezone, target function and arguments in one pass"""
+        for job in self.jobs:
+            # Verify each job's trigger has the correct timezone
+            self.assertEqual(_zone_name(job.trigger.timezone), 'Asia/Manila',
+                             f"Job {job.id} should use Manila timezone")
 
-        manila_tz = pytz.timezone('Asia/Manila')
+            # Verify job calls the send_scheduled_sales_report method
+            self.assertEqual(job.func, self.bot.send_scheduled_sales_report,
+                             f"Job {job.id} should reference send_scheduled_sales_report")
 
-        for job in jobs:
-            # Verify each job's trigger has the correct timezone
-            self.assertEqual(job.trigger.timezone, manila_tz,
-                           f"Job {job.id} should use Manila timezone")
+            # Verify job receives only the application as argument
+            self.assertEqual(tuple(job.args), (self.mock_app,),
+                             f"Job {job.id} should receive application as its only argument")
 
     def test_scheduler_starts_running(self):
         """Test that scheduler starts in running state"""
-        bot = TelegramGoogleSheetsBot()
-        mock_app = Mock()
-
-        scheduler = bot.setup_scheduler(mock_app)
+        # The cached scheduler is paused, so check a freshly started one
+        scheduler = self.start_scheduler(Mock())
+        self.addCleanup(scheduler.shutdown)
 
         # Verify scheduler is running
         self.assertTrue(scheduler.running, "Scheduler should be in running state")
 
-    def test_job_function_reference(self):
-        """Test that jobs reference the correct function"""
-        bot = TelegramGoogleSheetsBot()
-        mock_app = Mock()
-
-        scheduler = bot.setup_scheduler(mock_app)
-        jobs = scheduler.get_jobs()
-
-        for job in jobs:
-            # Verify job calls the send_scheduled_sales_report method
-            self.assertEqual(job.func, bot.send_scheduled_sales_report,
-                           f"Job {job.id} should reference send_scheduled_sales_report")
-
-    def test_job_arguments(self):
-        """Test that jobs receive the correct arguments"""
-        bot = TelegramGoogleSheetsBot()
-        mock_app = Mock()
-
-        scheduler = bot.setup_scheduler(mock_app)
-        jobs = scheduler.get_jobs()
-
-        for job in jobs:
-            # Verify job has application as argument
-            self.assertEqual(len(job.args), 1,
-                           f"Job {job.id} should have 1 argument")
-            self.assertEqual(job.args[0], mock_app,
-                           f"Job {job.id} should receive application as argument")
-
     def test_replace_existing_jobs(self):
         """Test that jobs replace existing ones with same ID"""
-        bot = TelegramGoogleSheetsBot()
+        # Needs its own schedulers rather than the cached one
         mock_app = Mock()
 
         # Set up scheduler twice
-        scheduler1 = bot.setup_scheduler(mock_app)
+        scheduler1 = self.start_scheduler(mock_app)
         job_count_1 = len(scheduler1.get_jobs())
 
         # Shutdown first scheduler
         scheduler1.shutdown()
 
         # Create second scheduler - should replace jobs
-        scheduler2 = bot.setup_scheduler(mock_app)
+        scheduler2 = self.start_scheduler(mock_app)
         job_count_2 = len(scheduler2.get_jobs())
 
         # Should have same number of jobs
         self.assertEqual(job_count_1, job_count_2,
                         "Job count should remain the same when replacing")
-        self.assertEqual(job_count_2, 2, "Should still have 2 jobs")
+        self.assertEqual(job_count_2, 3, "Should still have 3 jobs")
 
         scheduler2.shutdown()
 
 
-class TestScheduledReportExecution(unittest.IsolatedAsyncioTestCase):
+class TestScheduledReportExecution(_AsyncBotTestBase):
     """Test the scheduled report execution functionality"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.env_patcher = patch.dict(os.environ, {
-            'TELEGRAM_BOT_TOKEN': 'test_token_12345',
-            'ANTHROPIC_API_KEY': 'test_anthropic_key',
-            'SPREADSHEET_ID': 'test_spreadsheet_id',
-            'GOOGLE_CREDENTIALS_B64': 'dGVzdF9jcmVkZW50aWFscw==',
-            'TIMEZONE': 'Asia/Manila',
-            'REPORT_CHAT_ID': '123456789'
-        })
-        self.env_patcher.start()
-
-        self.anthropic_patcher = patch('telegram_bot.anthropic.Anthropic')
-        self.mock_anthropic = self.anthropic_patcher.start()
-
-        self.sheets_patcher = patch('telegram_bot.GoogleSheetsClient')
-        self.mock_sheets = self.sheets_patcher.start()
-
-    def tearDown(self):
-        """Clean up after tests"""
-        self.env_patcher.stop()
-        self.anthropic_patcher.stop()
-        self.sheets_patcher.stop()
-
     async def test_send_scheduled_report_success(self):
         """Test successful scheduled report sending"""
-        bot = TelegramGoogleSheetsBot()
-        mock_app = Mock()
-        mock_app.bot = AsyncMock()
-
         # Mock the analyze_sales_for_dates method
-        bot.analyze_sales_for_dates = Mock(return_value="Test sales report")
+        self.bot.analyze_sales_for_dates = Mock(return_value="Test sales report")
 
-        await bot.send_scheduled_sales_report(mock_app)
+        await self.bot.send_scheduled_sales_report(self.app)
+        calls = self.app.bot.calls
 
         # Verify message was sent
-        mock_app.bot.send_message.assert_called_once()
-        call_args = mock_app.bot.send_message.call_args
+        self.assertEqual(len(calls), 1)
 
         # Verify chat_id
-        self.assertEqual(call_args.kwargs['chat_id'], '123456789')
+        self.assertEqual(calls[0]['chat_id'], '123456789')
 
         # Verify message contains report
-        self.assertIn('Automated Sales Report', call_args.kwargs['text'])
-        self.assertIn('Test sales report', call_args.kwargs['text'])
+        self.assertIn('Automated Sales Report', calls[0]['text'])
+        self.assertIn('Test sales report', calls[0]['text'])
 
     async def test_send_scheduled_report_no_chat_id(self):
         """Test scheduled report skips when REPORT_CHAT_ID is not set"""
         with patch.dict(os.environ, {'REPORT_CHAT_ID': ''}, clear=False):
-            bot = TelegramGoogleSheetsBot()
-            mock_app = Mock()
-            mock_app.bot = AsyncMock()
-
-            await bot.send_scheduled_sales_report(mock_app)
+            await self.bot.send_scheduled_sales_report(self.app)
 
             # Verify message was NOT sent
-            mock_app.bot.send_message.assert_not_called()
+            self.assertEqual(self.app.bot.calls, [])
 
     async def test_send_scheduled_report_no_data(self):
         """Test scheduled report handles no data gracefully"""
-        bot = TelegramGoogleSheetsBot()
-        mock_app = Mock()
-        mock_app.bot = AsyncMock()
-
         # Mock analyze_sales_for_dates to return None
-        bot.analyze_sales_for_dates = Mock(return_value=None)
+        self.bot.analyze_sales_for_dates = Mock(return_value=None)
 
-        await bot.send_scheduled_sales_report(mock_app)
+        await self.bot.send_scheduled_sales_report(self.app)
+        calls = self.app.bot.calls
 
         # Verify warning message was sent
-        mock_app.bot.send_message.assert_called_once()
-        call_args = mock_app.bot.send_message.call_args
-        self.assertIn('Could not generate scheduled sales report', call_args.kwargs['text'])
+        self.assertEqual(len(calls), 1)
+        self.assertIn('Could not generate scheduled sales report', calls[0]['text'])
 
     async def test_send_scheduled_report_date_format(self):
         """Test that scheduled report uses correct date format"""
-        bot = TelegramGoogleSheetsBot()
-        mock_app = Mock()
-        mock_app.bot = AsyncMock()
-
-        bot.analyze_sales_for_dates = Mock(return_value="Test report")
+        self.bot.analyze_sales_for_dates = Mock(return_value="Test report")
 
-        # Mock datetime to test specific date
-        with patch('telegram_bot.datetime') as mock_datetime:
-            mock_now = datetime(2025, 3, 15, 15, 0, 0)
-            mock_datetime.now.return_value = mock_now
-            mock_datetime.strftime = datetime.strftime
-
-            await bot.send_scheduled_sales_report(mock_app)
+        # Pin only now(); everything else is the real datetime class
+        with patch('telegram_bot.datetime', _FixedDatetime):
+            await self.bot.send_scheduled_sales_report(self.app)
 
             # Verify analyze_sales_for_dates was called with correct date
-            bot.analyze_sales_for_dates.assert_called_once_with('2025-03-15', '2025-03-15')
+            self.bot.analyze_sales_for_dates.assert_called_once_with('2025-03-15', '2025-03-15')
 
 
-class TestEdgeCasesAndErrorHandling(unittest.IsolatedAsyncioTestCase):
+class TestEdgeCasesAndErrorHandling(_AsyncBotTestBase):
     """Test edge cases and error handling for scheduled reports"""
 
-    def setUp(self):
-        """Set up test fixtures"""
-        self.env_patcher = patch.dict(os.environ, {
-            'TELEGRAM_BOT_TOKEN': 'test_token_12345',
-            'ANTHROPIC_API_KEY': 'test_anthropic_key',
-            'SPREADSHEET_ID': 'test_spreadsheet_id',
-            'GOOGLE_CREDENTIALS_B64': 'dGVzdF9jcmVkZW50aWFscw==',
-            'TIMEZONE': 'Asia/Manila',
-            'REPORT_CHAT_ID': '123456789'
-        })
-        self.env_patcher.start()
-
-        self.anthropic_patcher = patch('telegram_bot.anthropic.Anthropic')
-        self.mock_anthropic = self.anthropic_patcher.start()
-
-        self.sheets_patcher = patch('telegram_bot.GoogleSheetsClient')
-        self.mock_sheets = self.sheets_patcher.start()
-
-    def tearDown(self):
-        """Clean up after tests"""
-        self.env_patcher.stop()
-        self.anthropic_patcher.stop()
-        self.sheets_patcher.stop()
-
     async def test_error_in_send_message(self):
         """Test error handling when sending message fails"""
-        bot = TelegramGoogleSheetsBot()
-        mock_app = Mock()
-        mock_app.bot = AsyncMock()
-        mock_app.bot.send_message.side_effect = Exception("Network error")
+        self.app.bot.error = Exception("Network error")
 
-        bot.analyze_sales_for_dates = Mock(return_value="Test report")
+        self.bot.analyze_sales_for_dates = Mock(return_value="Test report")
 
         # Should not raise exception
-        await bot.send_scheduled_sales_report(mock_app)
+        await self.bot.send_scheduled_sales_report(self.app)
 
     async def test_error_in_data_analysis(self):
         """Test error handling when data analysis fails"""
-        bot = TelegramGoogleSheetsBot()
-        mock_app = Mock()
-        mock_app.bot = AsyncMock()
-
-        bot.analyze_sales_for_dates = Mock(side_effect=Exception("Data error"))
+        self.bot.analyze_sales_for_dates = Mock(side_effect=Exception("Data error"))
 
         # Should not raise exception
-        await bot.send_scheduled_sales_report(mock_app)
+        await self.bot.send_scheduled_sales_report(self.app)
 
     def test_invalid_timezone_handling(self):
         """Test handling of invalid timezone"""
-        with patch.dict(os.environ, {'TIMEZONE': 'Invalid/Timezone'}):
-            bot = TelegramGoogleSheetsBot()
-            mock_app = Mock()
-
-            # Should raise exception for invalid timezone
-            with self.assertRaises(Exception):
-                bot.setup_scheduler(mock_app)
+        # setup_scheduler must surface pytz's error rather than fall back to a default zone
+        with patch.dict(os.environ, {'TIMEZONE': 'Invalid/Timezone'}), \
+                self.assertRaises(pytz.UnknownTimeZoneError):
+            self.bot.setup_scheduler(Mock())
 
-    def test_scheduler_multiple_timezone_configurations(self):
+    async def test_scheduler_multiple_timezone_configurations(self):
         """Test scheduler with different timezone configurations"""
         timezones = [
             'Asia/Manila',
@@ -407,31 +346,34 @@ class TestEdgeCasesAndErrorHandling(unittest.IsolatedAsyncioTestCase):
             'UTC'
         ]
 
+        # Each zone goes through the shared bot's setup_scheduler; no per-zone bot build.
+        # Async so start() finds the test's running event loop
         for tz in timezones:
             with self.subTest(timezone=tz):
                 with patch.dict(os.environ, {'TIMEZONE': tz}):
-                    bot = TelegramGoogleSheetsBot()
-                    mock_app = Mock()
+                    scheduler = self.bot.setup_scheduler(Mock())
+                self.addCleanup(scheduler.shutdown)
 
-                    scheduler = bot.setup_scheduler(mock_app)
-                    expected_tz = pytz.timezone(tz)
+                self.assertEqual(_zone_name(scheduler.timezone), tz)
 
-                    self.assertEqual(scheduler.timezone, expected_tz)
-                    scheduler.shutdown()
+
+# Test classes run by run_tests(), in order
+_TEST_CLASSES = (
+    TestCronSchedulerConfiguration,
+    TestScheduledReportExecution,
+    TestEdgeCasesAndErrorHandling,
+)
 
 
 def run_tests():
     """Run all test suites"""
     loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-
-    # Add all test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestCronSchedulerConfiguration))
-    suite.addTests(loader.loadTestsFromTestCase(TestScheduledReportExecution))
-    suite.addTests(loader.loadTestsFromTestCase(TestEdgeCasesAndErrorHandling))
+    suite = unittest.TestSuite(loader.loadTestsFromTestCase(test_class) for test_class in _TEST_CLASSES)
 
-    # Run tests with detailed output
-    runner = unittest.TextTestRunner(verbosity=2)
+    # Quiet by default; TEST_VERBOSITY=2 restores per-test lines. buffer=True only
+    # echoes a test's stdout/stderr when it fails
+    verbosity = int(os.environ.get('TEST_VERBOSITY', '1'))
+    runner = unittest.TextTestRunner(verbosity=verbosity, buffer=True)
     result = runner.run(suite)
 
     return result
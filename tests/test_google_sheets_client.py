@@ -0,0 +1,126 @@
+"""
+Test Suite for GoogleSheetsClient Response Parsing
+
+This test suite validates that read_sheet keeps returning the headers/data
+shape consumed by the bot, including when Sheets API responses are parsed
+with orjson instead of the stdlib json module.
+
+Test Coverage:
+- orjson response model, including the non-JSON fallback
+- read_sheet headers/data dict shape
+- Empty sheet handling
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+import json
+import os
+import sys
+import tempfile
+
+# Add parent directory to path to import google_sheets_client
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from googleapiclient.model import JsonModel
+
+import google_sheets_client
+from google_sheets_client import GoogleSheetsClient
+
+
+def make_client(values):
+    """Build a GoogleSheetsClient without authenticating, backed by canned values"""
+    client = GoogleSheetsClient.__new__(GoogleSheetsClient)
+    client.spreadsheet_id = 'test_spreadsheet_id'
+    client.service = MagicMock()
+    client.service.spreadsheets().values().get().execute.return_value = {'values': values}
+    return client
+
+
+class TestResponseParser(unittest.TestCase):
+    """Test the JSON model used to parse Sheets API responses"""
+
+    PAYLOAD = b'{"range": "ORDER!A1:C2", "values": [["Order Date", "Name"], ["August 4, 2025", "Juan Dela Cruz"]]}'
+
+    def models(self):
+        """The stock JsonModel plus the orjson model when it can be used"""
+        models = [JsonModel()]
+        if google_sheets_client.ORJSON_AVAILABLE:
+            models.append(google_sheets_client.OrjsonJsonModel())
+        return models
+
+    def test_deserialize_json_payload(self):
+        """Test that a values payload decodes like the stdlib would"""
+        for model in self.models():
+            with self.subTest(model=type(model).__name__):
+                parsed = model.deserialize(self.PAYLOAD)
+
+                self.assertEqual(parsed['values'][1], ['August 4, 2025', 'Juan Dela Cruz'])
+
+    def test_deserialize_non_json_falls_back(self):
+        """Test that a non-JSON body is returned as-is instead of raising"""
+        for model in self.models():
+            with self.subTest(model=type(model).__name__):
+                self.assertEqual(model.deserialize('not json'), 'not json')
+                self.assertEqual(model.deserialize(b'not json'), 'not json')
+
+    @unittest.skipUnless(google_sheets_client.ORJSON_AVAILABLE, "orjson not installed")
+    def test_service_built_with_orjson_model(self):
+        """Test that the Sheets service is built with the orjson model"""
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump({'type': 'service_account'}, f)
+        self.addCleanup(os.remove, f.name)
+
+        with patch.object(google_sheets_client, 'build') as mock_build, \
+                patch.object(google_sheets_client.service_account.Credentials, 'from_service_account_file'):
+            GoogleSheetsClient(credentials_file=f.name, spreadsheet_id='test_spreadsheet_id')
+
+        self.assertIsInstance(mock_build.call_args.kwargs['model'], google_sheets_client.OrjsonJsonModel)
+
+
+class TestReadSheetShape(unittest.TestCase):
+    """Test the dict shape returned by read_sheet"""
+
+    def test_headers_and_data_after_skipped_rows(self):
+        """Test that row 4 becomes headers and rows 5+ become data"""
+        values = [
+            ['Title'],
+            [],
+            [],
+            ['Order Date', 'Name', 'Price'],
+            ['August 4, 2025', 'Juan Dela Cruz', '₱250'],
+        ]
+        client = make_client(values)
+
+        result = client.read_sheet(range_name='A:AF', sheet_name='ORDER')
+
+        self.assertEqual(result['headers'], ['Order Date', 'Name', 'Price'])
+        self.assertEqual(result['data'], [['August 4, 2025', 'Juan Dela Cruz', '₱250']])
+
+    def test_empty_sheet(self):
+        """Test that an empty sheet returns empty headers and data"""
+        client = make_client([])
+
+        result = client.read_sheet(range_name='A:AF', sheet_name='ORDER')
+
+        self.assertEqual(result, {'headers': [], 'data': []})
+
+
+def run_tests():
+    """Run all test suites"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    # Add all test classes
+    suite.addTests(loader.loadTestsFromTestCase(TestResponseParser))
+    suite.addTests(loader.loadTestsFromTestCase(TestReadSheetShape))
+
+    # Run tests with detailed output
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return result
+
+
+if __name__ == '__main__':
+    result = run_tests()
+    sys.exit(0 if result.wasSuccessful() else 1)
@@ -11,53 +11,93 @@ import os
 import re
 
 
+# telegram_bot.py and the docs live one level above this tests/ directory; the bot source is read once at import
+_REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_BOT_FILE = os.path.join(_REPO_DIR, 'telegram_bot.py')
+_DOC_FILE = os.path.join(_REPO_DIR, 'SCHEDULED_REPORTS.md')
+with open(_BOT_FILE, 'r') as _f:
+    _SOURCE = _f.read()
+_LINES = _SOURCE.splitlines()
+
+EXPECTED_MODEL_ID = "claude-sonnet-4-5-20250929"
+OLD_MODEL_ID = "claude-3-5-sonnet-20240620"
+
+# Model ID checks computed once at import; the tests only assert against these
+_OLD_PRESENT = OLD_MODEL_ID in _SOURCE
+_NEW_COUNT = _SOURCE.count(EXPECTED_MODEL_ID)
+
+# Patterns compiled once at module scope
+_RE_HOUR15 = re.compile(r'hour\s*=\s*15')
+_RE_HOUR23 = re.compile(r'hour\s*=\s*23')
+# [^)] already matches newlines, so no flags; the {0,400}? bound keeps backtracking linear
+_RE_CRON_3PM = re.compile(r'CronTrigger\([^)]{0,400}?hour\s*=\s*15')
+_RE_CRON_11PM = re.compile(r'CronTrigger\([^)]{0,400}?hour\s*=\s*23')
+_RE_CRON_MINUTE0 = re.compile(r'CronTrigger\([^)]{0,400}?hour\s*=\s*(15|23)[^)]{0,400}?minute\s*=\s*0')
+_RE_ID_3PM = re.compile(r"id\s*=\s*['\"]sales_report_3pm['\"]")
+_RE_ID_11PM = re.compile(r"id\s*=\s*['\"]sales_report_11pm['\"]")
+_RE_SEND_REPORT = re.compile(r'async\s+def\s+send_scheduled_sales_report')
+_RE_SETUP_SCHEDULER = re.compile(r'def\s+setup_scheduler')
+_RE_TIMEZONE_ENV = re.compile(r"os\.getenv\s*\(\s*['\"]TIMEZONE['\"]")
+_RE_MESSAGES_CREATE = re.compile(r'\.messages\.create\s*\(')
+_RE_CLAUDE_MODEL_PARAM = re.compile(r'model\s*=\s*["\'](claude-[^"\']+)["\']')
+
+
+def _quoted_claude_ids(source):
+    """Quote-delimited 'claude-...' strings in source, found with str.find only"""
+    ids = []
+    i = source.find('claude-')
+    while i >= 0:
+        quote = source[i - 1] if i else ''
+        end = source.find(quote, i) if quote in ('"', "'") else -1
+        if end < 0:
+            # Unquoted mention (comment, docstring); keep scanning past it
+            i = source.find('claude-', i + 1)
+            continue
+        ids.append(source[i:end])
+        i = source.find('claude-', end + 1)
+    return ids
+
+
 class TestCronJobImplementation(unittest.TestCase):
     """Verify cron job implementation in telegram_bot.py"""
 
     def setUp(self):
-        """Load telegram_bot.py source code"""
-        self.bot_file = os.path.join(os.path.dirname(__file__), 'telegram_bot.py')
-        with open(self.bot_file, 'r') as f:
-            self.source_code = f.read()
-            self.source_lines = f.readlines()
+        """Bind the telegram_bot.py source read at import"""
+        self.bot_file = _BOT_FILE
+        self.source_code = _SOURCE
 
     def test_3pm_cron_job_exists(self):
         """Verify 3 PM (hour=15) cron job is configured"""
         # Look for hour=15 (3 PM in 24-hour format)
-        pattern_hour15 = r'hour\s*=\s*15'
-        matches = re.findall(pattern_hour15, self.source_code)
+        match = _RE_HOUR15.search(self.source_code)
 
-        self.assertGreater(len(matches), 0,
-                          "Should find at least one cron job configured for hour=15 (3 PM)")
+        self.assertIsNotNone(match,
+                             "Should find at least one cron job configured for hour=15 (3 PM)")
 
         # Verify it's part of a CronTrigger
-        pattern_cron_3pm = r'CronTrigger\s*\([^)]*hour\s*=\s*15'
-        matches_cron = re.findall(pattern_cron_3pm, self.source_code, re.MULTILINE | re.DOTALL)
+        match_cron = _RE_CRON_3PM.search(self.source_code)
 
-        self.assertGreater(len(matches_cron), 0,
-                          "Should find CronTrigger configuration with hour=15 (3 PM)")
+        self.assertIsNotNone(match_cron,
+                             "Should find CronTrigger configuration with hour=15 (3 PM)")
 
     def test_11pm_cron_job_exists(self):
         """Verify 11 PM (hour=23) cron job is configured"""
         # Look for hour=23 (11 PM in 24-hour format)
-        pattern_hour23 = r'hour\s*=\s*23'
-        matches = re.findall(pattern_hour23, self.source_code)
+        match = _RE_HOUR23.search(self.source_code)
 
-        self.assertGreater(len(matches), 0,
-                          "Should find at least one cron job configured for hour=23 (11 PM)")
+        self.assertIsNotNone(match,
+                             "Should find at least one cron job configured for hour=23 (11 PM)")
 
         # Verify it's part of a CronTrigger
-        pattern_cron_11pm = r'CronTrigger\s*\([^)]*hour\s*=\s*23'
-        matches_cron = re.findall(pattern_cron_11pm, self.source_code, re.MULTILINE | re.DOTALL)
+        match_cron = _RE_CRON_11PM.search(self.source_code)
 
-        self.assertGreater(len(matches_cron), 0,
-                          "Should find CronTrigger configuration with hour=23 (11 PM)")
+        self.assertIsNotNone(match_cron,
+                             "Should find CronTrigger configuration with hour=23 (11 PM)")
 
     def test_both_cron_jobs_have_correct_minutes(self):
         """Verify both cron jobs are set to minute=0"""
         # Look for CronTrigger configurations with minute=0
-        pattern = r'CronTrigger\s*\([^)]*hour\s*=\s*(15|23)[^)]*minute\s*=\s*0'
-        matches = re.findall(pattern, self.source_code, re.MULTILINE | re.DOTALL)
+        matches = _RE_CRON_MINUTE0.findall(self.source_code)
 
         self.assertEqual(len(matches), 2,
                         "Should find exactly 2 CronTrigger configurations with minute=0 "
@@ -66,16 +106,13 @@ class TestCronJobImplementation(unittest.TestCase):
     def test_cron_job_ids_are_unique(self):
         """Verify cron jobs have unique and descriptive IDs"""
         # Look for job IDs
-        pattern_3pm_id = r"id\s*=\s*['\"]sales_report_3pm['\"]"
-        pattern_11pm_id = r"id\s*=\s*['\"]sales_report_11pm['\"]"
-
-        matches_3pm = re.findall(pattern_3pm_id, self.source_code)
-        matches_11pm = re.findall(pattern_11pm_id, self.source_code)
+        match_3pm = _RE_ID_3PM.search(self.source_code)
+        match_11pm = _RE_ID_11PM.search(self.source_code)
 
-        self.assertGreater(len(matches_3pm), 0,
-                          "Should find 'sales_report_3pm' job ID")
-        self.assertGreater(len(matches_11pm), 0,
-                          "Should find 'sales_report_11pm' job ID")
+        self.assertIsNotNone(match_3pm,
+                             "Should find 'sales_report_3pm' job ID")
+        self.assertIsNotNone(match_11pm,
+                             "Should find 'sales_report_11pm' job ID")
 
     def test_scheduler_uses_apscheduler(self):
         """Verify APScheduler is being used for scheduling"""
@@ -88,19 +125,17 @@ class TestCronJobImplementation(unittest.TestCase):
 
     def test_send_scheduled_sales_report_method_exists(self):
         """Verify send_scheduled_sales_report method exists"""
-        pattern = r'async\s+def\s+send_scheduled_sales_report'
-        matches = re.findall(pattern, self.source_code)
+        match = _RE_SEND_REPORT.search(self.source_code)
 
-        self.assertGreater(len(matches), 0,
-                          "Should have async send_scheduled_sales_report method")
+        self.assertIsNotNone(match,
+                             "Should have async send_scheduled_sales_report method")
 
     def test_setup_scheduler_method_exists(self):
         """Verify setup_scheduler method exists"""
-        pattern = r'def\s+setup_scheduler'
-        matches = re.findall(pattern, self.source_code)
+        match = _RE_SETUP_SCHEDULER.search(self.source_code)
 
-        self.assertGreater(len(matches), 0,
-                          "Should have setup_scheduler method")
+        self.assertIsNotNone(match,
+                             "Should have setup_scheduler method")
 
     def test_timezone_support(self):
         """Verify timezone support is implemented"""
@@ -109,31 +144,29 @@ class TestCronJobImplementation(unittest.TestCase):
                      "Should use pytz for timezone support")
 
         # Check for timezone configuration
-        pattern = r"os\.getenv\s*\(\s*['\"]TIMEZONE['\"]"
-        matches = re.findall(pattern, self.source_code)
+        match = _RE_TIMEZONE_ENV.search(self.source_code)
 
-        self.assertGreater(len(matches), 0,
-                          "Should read TIMEZONE from environment variables")
+        self.assertIsNotNone(match,
+                             "Should read TIMEZONE from environment variables")
 
 
 class TestAIModelUpgrade(unittest.TestCase):
     """Verify AI model has been upgraded to Sonnet 4.5"""
 
-    EXPECTED_MODEL_ID = "claude-sonnet-4-5-20250929"
-    OLD_MODEL_ID = "claude-3-5-sonnet-20240620"
+    EXPECTED_MODEL_ID = EXPECTED_MODEL_ID
+    OLD_MODEL_ID = OLD_MODEL_ID
 
     def setUp(self):
-        """Load telegram_bot.py source code"""
-        self.bot_file = os.path.join(os.path.dirname(__file__), 'telegram_bot.py')
-        with open(self.bot_file, 'r') as f:
-            self.source_code = f.read()
-            self.source_lines = f.readlines()
+        """Bind the telegram_bot.py source read at import"""
+        self.bot_file = _BOT_FILE
+        self.source_code = _SOURCE
+        self.source_lines = _LINES
 
     def test_old_model_not_present(self):
         """CRITICAL: Verify old model ID is NOT in the codebase"""
-        count = self.source_code.count(self.OLD_MODEL_ID)
+        if _OLD_PRESENT:
+            count = self.source_code.count(self.OLD_MODEL_ID)
 
-        if count > 0:
             # Find line numbers with old model ID
             lines_with_old_model = []
             for i, line in enumerate(self.source_lines, 1):
@@ -151,7 +184,7 @@ class TestAIModelUpgrade(unittest.TestCase):
 
     def test_new_model_present(self):
         """CRITICAL: Verify new Sonnet 4.5 model ID is in the codebase"""
-        count = self.source_code.count(self.EXPECTED_MODEL_ID)
+        count = _NEW_COUNT
 
         if count == 0:
             self.fail(
@@ -167,20 +200,15 @@ class TestAIModelUpgrade(unittest.TestCase):
     def test_anthropic_client_usage(self):
         """Verify Anthropic client is being used correctly"""
         # Check for anthropic.messages.create calls
-        pattern = r'\.messages\.create\s*\('
-        matches = re.findall(pattern, self.source_code)
+        match = _RE_MESSAGES_CREATE.search(self.source_code)
 
-        self.assertGreater(len(matches), 0,
-                          "Should have calls to anthropic.messages.create")
+        self.assertIsNotNone(match,
+                             "Should have calls to anthropic.messages.create")
 
     def test_model_parameter_in_api_calls(self):
         """Verify model parameter is specified in API calls"""
-        # Look for model parameter in API calls
-        pattern = r'model\s*=\s*["\']([^"\']+)["\']'
-        matches = re.findall(pattern, self.source_code)
-
-        # Filter to only Claude models
-        claude_models = [m for m in matches if 'claude' in m.lower()]
+        # Look for quoted Claude model IDs
+        claude_models = _quoted_claude_ids(self.source_code)
 
         self.assertGreater(len(claude_models), 0,
                           "Should find Claude model specifications in API calls")
@@ -192,18 +220,19 @@ class TestAIModelUpgrade(unittest.TestCase):
 
     def test_no_mixed_model_versions(self):
         """Verify no mixing of old and new model versions"""
-        # Count all Claude model references
-        pattern = r'model\s*=\s*["\']claude-[^"\']+["\']'
-        all_models = re.findall(pattern, self.source_code)
-
-        if not all_models:
+        # Plain substring check first; only run the regex if a Claude model can be there
+        if 'claude-' not in self.source_code:
             self.fail("No Claude model specifications found in code")
 
-        # Extract just the model IDs
-        model_ids = [re.search(r'["\']([^"\']+)["\']', m).group(1) for m in all_models]
+        # Collect model IDs incrementally, stopping once two different ones are seen
+        unique_models = set()
+        for match in _RE_CLAUDE_MODEL_PARAM.finditer(self.source_code):
+            unique_models.add(match.group(1))
+            if len(unique_models) > 1:
+                break
 
-        # All should be the same (new) model
-        unique_models = set(model_ids)
+        if not unique_models:
+            self.fail("No Claude model specifications found in code")
 
         if len(unique_models) > 1:
             self.fail(
@@ -222,13 +251,13 @@ class TestDocumentation(unittest.TestCase):
 
     def test_scheduled_reports_documentation_exists(self):
         """Verify SCHEDULED_REPORTS.md file exists"""
-        doc_file = os.path.join(os.path.dirname(__file__), 'SCHEDULED_REPORTS.md')
+        doc_file = _DOC_FILE
         self.assertTrue(os.path.exists(doc_file),
                        "SCHEDULED_REPORTS.md documentation should exist")
 
     def test_documentation_mentions_schedule_times(self):
         """Verify documentation mentions 3 PM and 11 PM"""
-        doc_file = os.path.join(os.path.dirname(__file__), 'SCHEDULED_REPORTS.md')
+        doc_file = _DOC_FILE
 
         if os.path.exists(doc_file):
             with open(doc_file, 'r') as f:
@@ -240,18 +269,23 @@ class TestDocumentation(unittest.TestCase):
                          "Documentation should mention 11 PM schedule")
 
 
+# Test classes run by run_tests(), in order
+_TEST_CLASSES = (
+    TestCronJobImplementation,
+    TestAIModelUpgrade,
+    TestDocumentation,
+)
+
+
 def run_tests():
     """Run all verification tests"""
     loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-
-    # Add test classes
-    suite.addTests(loader.loadTestsFromTestCase(TestCronJobImplementation))
-    suite.addTests(loader.loadTestsFromTestCase(TestAIModelUpgrade))
-    suite.addTests(loader.loadTestsFromTestCase(TestDocumentation))
+    suite = unittest.TestSuite(loader.loadTestsFromTestCase(test_class) for test_class in _TEST_CLASSES)
 
-    # Run with detailed output
-    runner = unittest.TextTestRunner(verbosity=2)
+    # Quiet by default; TEST_VERBOSITY=2 restores per-test lines. buffer=True only
+    # echoes a test's stdout/stderr when it fails
+    verbosity = int(os.environ.get('TEST_VERBOSITY', '1'))
+    runner = unittest.TextTestRunner(verbosity=verbosity, buffer=True)
     result = runner.run(suite)
 
     # Print summary